@@ -16,26 +16,38 @@ from ralph_loop.loop import (
 from ralph_loop.state import RalphState
 
 
-def main() -> int:
-    """Main CLI entry point with subcommands."""
-    parser = argparse.ArgumentParser(
-        prog="ralph",
-        description="Ralph iterative development loop for Gemini CLI",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  ralph start "Build a REST API" --max-iterations 20
-  ralph start "Fix auth bug" --completion-promise "ALL TESTS PASS"
-  ralph iterate --summary "Added login feature"
-  ralph resume
-  ralph cancel
-  ralph status
-        """,
-    )
+class _CachedFormatterParser(argparse.ArgumentParser):
+    """ArgumentParser that reuses one HelpFormatter for validation.
+
+    argparse calls _get_formatter() internally while arguments are added
+    (each construction re-reads colorization env vars on newer Pythons);
+    caching the instance keeps that to a single construction. Help and
+    usage rendering drop the cache first, since formatters accumulate
+    section state and cannot be reused across renders.
+    """
+
+    _formatter_cache: argparse.HelpFormatter | None = None
+
+    def _get_formatter(self) -> argparse.HelpFormatter:
+        if self._formatter_cache is None:
+            self._formatter_cache = super()._get_formatter()
+        return self._formatter_cache
+
+    def format_usage(self) -> str:
+        self._formatter_cache = None
+        return super().format_usage()
+
+    def format_help(self) -> str:
+        self._formatter_cache = None
+        return super().format_help()
 
-    subparsers = parser.add_subparsers(dest="command", required=True)
 
-    # Start command
+def _join_prompt(tokens: list[str]) -> str:
+    """Join prompt tokens, skipping the copy for the common quoted-prompt case."""
+    return tokens[0] if len(tokens) == 1 else " ".join(tokens)
+
+
+def _add_start_parser(subparsers) -> None:
     start_parser = subparsers.add_parser("start", help="Start a new Ralph loop")
     start_parser.add_argument(
         "prompt",
@@ -57,13 +69,16 @@ Examples:
         help="Phrase that signals task completion"
     )
 
-    # Cancel command
+
+def _add_cancel_parser(subparsers) -> None:
     subparsers.add_parser("cancel", help="Cancel the active Ralph loop")
 
-    # Status command
+
+def _add_status_parser(subparsers) -> None:
     subparsers.add_parser("status", help="Show current loop status")
 
-    # Iterate command (NEW)
+
+def _add_iterate_parser(subparsers) -> None:
     iterate_parser = subparsers.add_parser("iterate", help="Advance to next iteration")
     iterate_parser.add_argument(
         "--summary", "-s",
@@ -72,16 +87,58 @@ Examples:
         help="Summary of what was accomplished in this iteration"
     )
 
-    # Resume command (NEW)
+
+def _add_resume_parser(subparsers) -> None:
     subparsers.add_parser("resume", help="Resume a stopped loop")
 
-    # History command (NEW)
+
+def _add_history_parser(subparsers) -> None:
     subparsers.add_parser("history", help="Show iteration history")
 
+
+_SUBCOMMAND_BUILDERS = {
+    "start": _add_start_parser,
+    "cancel": _add_cancel_parser,
+    "status": _add_status_parser,
+    "iterate": _add_iterate_parser,
+    "resume": _add_resume_parser,
+    "history": _add_history_parser,
+}
+
+
+def main() -> int:
+    """Main CLI entry point with subcommands."""
+    parser = _CachedFormatterParser(
+        prog="ralph",
+        description="Ralph iterative development loop for Gemini CLI",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  ralph start "Build a REST API" --max-iterations 20
+  ralph start "Fix auth bug" --completion-promise "ALL TESTS PASS"
+  ralph iterate --summary "Added login feature"
+  ralph resume
+  ralph cancel
+  ralph status
+        """,
+    )
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    # Build only the chosen subparser; fall back to building all of them
+    # for --help, bad commands, and anything else that needs the full list.
+    argv = sys.argv[1:]
+    first_positional = next((a for a in argv if not a.startswith("-")), None)
+    if first_positional in _SUBCOMMAND_BUILDERS and "-h" not in argv and "--help" not in argv:
+        _SUBCOMMAND_BUILDERS[first_positional](subparsers)
+    else:
+        for build in _SUBCOMMAND_BUILDERS.values():
+            build(subparsers)
+
     args = parser.parse_args()
 
     if args.command == "start":
-        prompt = " ".join(args.prompt)
+        prompt = _join_prompt(args.prompt)
         if not prompt.strip():
             parser.error("Prompt cannot be empty")
         if args.max_iterations < 0:
@@ -116,7 +173,7 @@ Examples:
 
 def start_loop() -> int:
     """Direct entry point for ralph-loop command."""
-    parser = argparse.ArgumentParser(
+    parser = _CachedFormatterParser(
         prog="ralph-loop",
         description="Start a Ralph iterative development loop",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -143,7 +200,7 @@ def start_loop() -> int:
     )
 
     args = parser.parse_args()
-    prompt = " ".join(args.prompt)
+    prompt = _join_prompt(args.prompt)
 
     if not prompt.strip():
         parser.error("Prompt cannot be empty")
@@ -172,27 +229,28 @@ def show_status() -> int:
         print("No active Ralph loop")
         return 0  # Not an error, just informational
 
-    print("📊 Ralph Loop Status")
-    print("=" * 40)
-    print(f"Status: {'🟢 Active' if state.active else '🔴 Stopped'}")
+    lines = [
+        "📊 Ralph Loop Status",
+        "=" * 40,
+        f"Status: {'🟢 Active' if state.active else '🔴 Stopped'}",
+    ]
 
     # Show iteration with progress
     if state.max_iterations > 0:
         progress = state.progress_percent
-        print(f"Iteration: {state.iteration} / {state.max_iterations} ({progress}%)")
+        lines.append(f"Iteration: {state.iteration} / {state.max_iterations} ({progress}%)")
     else:
-        print(f"Iteration: {state.iteration} (unlimited)")
+        lines.append(f"Iteration: {state.iteration} (unlimited)")
 
     if state.completion_promise:
-        print(f"Promise: \"{state.completion_promise}\"")
+        lines.append(f"Promise: \"{state.completion_promise}\"")
     else:
-        print("Promise: none")
+        lines.append("Promise: none")
+
+    lines.append(f"Started: {state.started_at_dt.strftime('%Y-%m-%d %H:%M:%S UTC')}")
+    lines.extend(["", "Prompt:", "-" * 40, state.prompt])
 
-    print(f"Started: {state.started_at.strftime('%Y-%m-%d %H:%M:%S UTC')}")
-    print()
-    print("Prompt:")
-    print("-" * 40)
-    print(state.prompt)
+    sys.stdout.write("\n".join(lines) + "\n")
 
     return 0
 
@@ -205,19 +263,17 @@ def show_history() -> int:
         print("No Ralph loop found")
         return 0
 
-    print("📜 Ralph Loop History")
-    print("=" * 40)
+    lines = ["📜 Ralph Loop History", "=" * 40]
 
     if not state.history:
-        print("No history entries yet")
-        return 0
-
-    for entry in state.history:
-        ts_str = entry.timestamp.strftime("%Y-%m-%d %H:%M:%S UTC")
-        print(f"  [{entry.iteration}] {entry.summary} (@{ts_str})")
+        lines.append("No history entries yet")
+    else:
+        for entry in state.history:
+            ts_str = entry.timestamp_dt.strftime("%Y-%m-%d %H:%M:%S UTC")
+            lines.append(f"  [{entry.iteration}] {entry.summary} (@{ts_str})")
+        lines.extend(["", f"Current iteration: {state.iteration}"])
 
-    print()
-    print(f"Current iteration: {state.iteration}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
     return 0
 
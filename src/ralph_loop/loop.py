@@ -5,7 +5,7 @@ Provides functions for setting up, running, and canceling loops.
 """
 
 import sys
-from datetime import datetime, timezone
+from datetime import UTC, datetime
 from pathlib import Path
 
 from ralph_loop.state import DEFAULT_STATE_FILE, RalphState
@@ -44,7 +44,7 @@ def setup_ralph_loop(
         iteration=1,
         max_iterations=max_iterations,
         completion_promise=completion_promise,
-        started_at=datetime.now(timezone.utc),
+        started_at=datetime.now(UTC),
         prompt=prompt,
     )
 
@@ -203,6 +203,11 @@ def check_completion(
     Returns:
         True if the loop should end (promise fulfilled)
     """
+    # Cheap substring guard: no promise tag in the output means no promise
+    # can match, so skip loading the state entirely.
+    if "<promise>" not in output.casefold():
+        return False
+
     state = RalphState.from_file(state_file)
 
     if state is None:
@@ -221,18 +226,24 @@ def _print_activation(state: RalphState, state_file: Path | str) -> None:
     max_iter_display = str(state.max_iterations) if state.max_iterations > 0 else "unlimited"
     promise_display = state.completion_promise if state.completion_promise else "none"
 
-    print("🔄 Ralph loop activated!")
-    print()
-    print(f"Iteration: {state.iteration}")
-    print(f"Max iterations: {max_iter_display}")
-    print(f"Completion promise: {promise_display}")
-    print()
-    print(f"To monitor: cat {state_file}")
-    print("To cancel: ralph cancel")
-    print()
-    print(state.prompt)
+    lines = [
+        "🔄 Ralph loop activated!",
+        "",
+        f"Iteration: {state.iteration}",
+        f"Max iterations: {max_iter_display}",
+        f"Completion promise: {promise_display}",
+        "",
+        f"To monitor: cat {state_file}",
+        "To cancel: ralph cancel",
+        "",
+        state.prompt,
+    ]
 
     if state.completion_promise:
-        print()
-        print(f"To complete, output: <promise>{state.completion_promise}</promise>")
-        print("Only when the statement is genuinely TRUE!")
+        lines.extend([
+            "",
+            f"To complete, output: <promise>{state.completion_promise}</promise>",
+            "Only when the statement is genuinely TRUE!",
+        ])
+
+    sys.stdout.write("\n".join(lines) + "\n")
@@ -2,27 +2,145 @@
 State management for Ralph Loop.
 
 Handles reading, writing, and updating the loop state file.
+
+pathlib and datetime are imported inside the functions that need them:
+both are comparatively expensive imports, and deferring them trims the
+cold-start cost this CLI pays on every Gemini turn.
 """
 
+from __future__ import annotations
+
+import copy
+import json
+import mmap
+import os
 import re
 import sys
+import time
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
-from pathlib import Path
-from typing import Self
+from functools import lru_cache
+from typing import TYPE_CHECKING, Self
+
+if TYPE_CHECKING:
+    from datetime import datetime
+    from pathlib import Path
 
 DEFAULT_STATE_FILE = ".gemini/ralph-loop.local.md"
 
 
-@dataclass
+def _sidecar_path(path: Path) -> Path:
+    """Path of the JSON sidecar that is the machine-readable source of truth."""
+    return path.with_name(path.name + ".json")
+
+
+def _history_log_path(path: Path) -> Path:
+    """Path of the append-only history log next to the state file."""
+    return path.with_name(path.name + ".history.jsonl")
+
+
+# Number of history entries already on disk per log file, so save() can
+# append only the new entries instead of rewriting the whole log.
+_HISTORY_PERSISTED: dict[Path, int] = {}
+
+# Directories already created by save(), so repeat saves skip the mkdir.
+_KNOWN_DIRS: set[Path] = set()
+
+# Parsed states keyed by path, invalidated when the on-disk files change.
+_STATE_CACHE: dict[Path, tuple[tuple, RalphState]] = {}
+
+
+def _stat_signature(path: Path) -> tuple:
+    """Fingerprint of the state files on disk, for cache invalidation."""
+    sig = []
+    for p in (_sidecar_path(path), _history_log_path(path), path):
+        try:
+            st = p.stat()
+            sig.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            sig.append(None)
+    return tuple(sig)
+
+
+def _utcnow() -> datetime:
+    """Current UTC time; default factory for started_at."""
+    from datetime import UTC, datetime
+
+    return datetime.now(UTC)
+
+
+def _format_ts(dt: datetime) -> str:
+    """Format a timestamp as ISO-8601 with a trailing Z for UTC."""
+    from datetime import UTC
+
+    if dt.tzinfo:
+        dt = dt.astimezone(UTC)
+    return dt.isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def _epoch(ts: int | float | str) -> int:
+    """Coerce an ISO string or numeric timestamp to epoch seconds."""
+    if isinstance(ts, str):
+        from datetime import datetime
+
+        return int(datetime.fromisoformat(ts).timestamp())
+    return int(ts)
+
+
+# Files at least this large are memory-mapped instead of buffered-read.
+_MMAP_THRESHOLD = 64 * 1024
+
+
+def _read_file_bytes(path: Path) -> bytes:
+    """Read a whole file, memory-mapping it once it outgrows the threshold."""
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size >= _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return bytes(mm)
+        return f.read()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write bytes to a sibling tempfile and rename it into place."""
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+# Generic promise-tag pattern, compiled once at import; the captured text
+# is compared against the configured promise in check_promise.
+_PROMISE_RE = re.compile(r"<promise>(.*?)</promise>", re.IGNORECASE | re.DOTALL)
+
+
+@lru_cache(maxsize=8)
+def _promise_needle(promise: str) -> str:
+    """Casefolded exact-match needle for the substring fast path."""
+    return f"<promise>{promise}</promise>".casefold()
+
+
+@dataclass(slots=True)
 class HistoryEntry:
-    """Represents a single iteration history entry."""
+    """Represents a single iteration history entry.
+
+    The timestamp is kept as epoch seconds — an int serializes as-is and
+    avoids a datetime object per entry; use :attr:`timestamp_dt` for display.
+    """
     iteration: int
     summary: str
-    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    timestamp: int = field(default_factory=lambda: int(time.time()))
+
+    @property
+    def timestamp_dt(self) -> datetime:
+        """Timestamp as an aware UTC datetime, for display."""
+        from datetime import UTC, datetime
+
+        return datetime.fromtimestamp(self.timestamp, tz=UTC)
 
 
-@dataclass
+@dataclass(slots=True)
 class RalphState:
     """
     Represents the current state of a Ralph loop.
@@ -32,7 +150,9 @@ class RalphState:
         iteration: Current iteration number
         max_iterations: Maximum iterations (0 = unlimited)
         completion_promise: Phrase that signals completion
-        started_at: When the loop was started
+        started_at: When the loop was started. Parsers store the raw ISO
+            string and defer datetime construction to started_at_dt, since
+            most commands never look at it.
         prompt: The task prompt
         history: List of iteration history entries
     """
@@ -40,9 +160,26 @@ class RalphState:
     iteration: int = 1
     max_iterations: int = 0
     completion_promise: str | None = None
-    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: datetime | str = field(default_factory=_utcnow)
     prompt: str = ""
     history: list[HistoryEntry] = field(default_factory=list)
+    # Last rendered status line plus the field values it was built from,
+    # so repeated reads skip the formatting until an input changes.
+    _status_cache: tuple[bool, int, int, str] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def started_at_dt(self) -> datetime:
+        """Start time as a datetime, parsed (and memoized) on first access."""
+        if isinstance(self.started_at, str):
+            from datetime import datetime
+
+            try:
+                self.started_at = datetime.fromisoformat(self.started_at)
+            except ValueError:
+                self.started_at = _utcnow()
+        return self.started_at
 
     @classmethod
     def from_file(cls, path: Path | str = DEFAULT_STATE_FILE) -> Self | None:
@@ -55,13 +192,100 @@ class RalphState:
         Returns:
             RalphState instance or None if file doesn't exist
         """
+        from pathlib import Path
+
         path = Path(path)
-        if not path.exists():
-            return None
 
-        content = path.read_text(encoding="utf-8")
+        # Skip the reparse entirely when nothing on disk has changed.
+        sig = _stat_signature(path)
+        cached = _STATE_CACHE.get(path)
+        if cached is not None and cached[0] == sig:
+            return copy.deepcopy(cached[1])
+
+        state = cls._load(path)
+        if state is not None:
+            _STATE_CACHE[path] = (sig, copy.deepcopy(state))
+        return state
+
+    @classmethod
+    def _load(cls, path: Path) -> Self | None:
+        """Read and parse the state files without consulting the cache."""
+        # Prefer the JSON sidecar; fall back to parsing the markdown for
+        # state files written before the sidecar existed. Opening directly
+        # and catching the miss avoids a redundant stat per file.
+        try:
+            data = _read_file_bytes(_sidecar_path(path))
+        except OSError:
+            data = None
+        if data is not None:
+            state = cls.from_bytes(data)
+            if state is not None:
+                state._load_history_log(_history_log_path(path))
+                return state
+
+        try:
+            content = _read_file_bytes(path).decode("utf-8")
+        except OSError:
+            return None
         return cls.from_string(content)
 
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Self | None:
+        """
+        Parse state from JSON bytes (the sidecar format).
+
+        Returns None if data is invalid or corrupt.
+        """
+        try:
+            obj = json.loads(data)
+            history = [
+                HistoryEntry(
+                    iteration=int(entry["iteration"]),
+                    summary=entry["summary"],
+                    timestamp=_epoch(entry["timestamp"]),
+                )
+                for entry in obj.get("history", [])
+            ]
+            # Coerce field values so a hand-edited or corrupt sidecar is
+            # rejected here instead of blowing up on a later attribute use
+            started_at = obj["started_at"]
+            if not isinstance(started_at, str):
+                raise TypeError(f"started_at must be a string, got {type(started_at).__name__}")
+            return cls(
+                active=bool(obj["active"]),
+                iteration=int(obj["iteration"]),
+                max_iterations=int(obj["max_iterations"]),
+                completion_promise=obj["completion_promise"],
+                started_at=started_at,
+                prompt=obj["prompt"],
+                history=history,
+            )
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"Warning: Failed to parse state sidecar: {e}", file=sys.stderr)
+            return None
+
+    def _load_history_log(self, log_path: Path) -> None:
+        """Append entries from the history log, skipping malformed lines."""
+        try:
+            f = log_path.open(encoding="utf-8")
+        except OSError:
+            return
+        with f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    obj = json.loads(line)
+                    self.history.append(HistoryEntry(
+                        iteration=obj["iteration"],
+                        summary=obj["summary"],
+                        timestamp=_epoch(obj["timestamp"]),
+                    ))
+                except (ValueError, KeyError, TypeError):
+                    continue
+        _HISTORY_PERSISTED[log_path] = len(self.history)
+
     @classmethod
     def from_string(cls, content: str) -> Self | None:
         """
@@ -78,81 +302,72 @@ class RalphState:
 
     @classmethod
     def _parse_content(cls, content: str) -> Self | None:
-        """Internal parsing logic."""
-        # Normalize line endings
-        content = content.replace("\r\n", "\n")
+        """Internal parsing logic.
 
-        # Parse YAML frontmatter
-        match = re.match(r"^---\n(.*?)\n---\n(.*)$", content, re.DOTALL)
-        if not match:
+        Single forward pass over the lines: track whether we are inside the
+        frontmatter (between the two ``---`` fences) and inside the history
+        block, and split fields with str methods instead of per-field regex
+        scans, since this path runs on every load.
+        """
+        # Normalize line endings, skipping the full-string copy when there
+        # are none to normalize (files written by save() always use \n)
+        if "\r" in content:
+            content = content.replace("\r\n", "\n")
+
+        lines = content.split("\n")
+        if not lines or lines[0] != "---":
             return None
 
-        frontmatter, prompt = match.groups()
+        fields: dict[str, str] = {}
+        history: list[HistoryEntry] = []
+        in_history = False
+        fence_end = None
+
+        for i in range(1, len(lines)):
+            line = lines[i]
+            if line == "---":
+                fence_end = i
+                break
+
+            if in_history:
+                stripped = line.strip()
+                if stripped.startswith("-"):
+                    # Extract quoted entry: - "..."
+                    entry_text = stripped[1:].strip()
+                    if entry_text.startswith('"') and entry_text.endswith('"'):
+                        entry = cls._parse_history_entry(entry_text[1:-1])
+                        if entry is not None:
+                            history.append(entry)
+                    continue
+
+            key, sep, value = line.partition(":")
+            if not sep or line.startswith(" "):
+                continue
+            if key == "history":
+                in_history = True
+                continue
+            in_history = False
+            fields[key] = value.strip()
+
+        if fence_end is None:
+            return None
 
-        def get_field(name: str, default: str = "") -> str:
-            # Match field at start of line in frontmatter
-            m = re.search(rf"^{name}:\s*(.*)$", frontmatter, re.MULTILINE)
-            return m.group(1).strip() if m else default
+        prompt = "\n".join(lines[fence_end + 1:])
 
         # Parse basic fields
-        active = get_field("active") == "true"
-        iteration = int(get_field("iteration", "1"))
-        max_iterations = int(get_field("max_iterations", "0"))
+        active = fields.get("active") == "true"
+        iteration = int(fields.get("iteration", "1"))
+        max_iterations = int(fields.get("max_iterations", "0"))
 
         # Handle completion promise
-        promise_raw = get_field("completion_promise")
+        promise_raw = fields.get("completion_promise", "")
         if promise_raw == "null" or not promise_raw:
             completion_promise = None
         else:
             completion_promise = promise_raw.strip('"\'')
 
-        # Parse datetime
-        started_at_str = get_field("started_at").strip('"')
-        try:
-            started_at = datetime.fromisoformat(started_at_str.replace("Z", "+00:00"))
-        except ValueError:
-            started_at = datetime.now(timezone.utc)
-
-        # Parse history
-        history = []
-        # Find history block
-        # Match from "history:" until end of string since it's the last section in frontmatter
-        history_match = re.search(r"history:\s*\n(.*)", frontmatter, re.DOTALL)
-        if history_match:
-            history_text = history_match.group(1)
-            for line in history_text.split("\n"):
-                line = line.strip()
-                if not line or not line.startswith("-"):
-                    continue
-
-                # Extract quoted entry: - "..."
-                entry_match = re.search(r'-\s*"([^"]+)"', line)
-                if not entry_match:
-                    continue
-
-                entry_text = entry_match.group(1)
-                ts_match = re.search(r"iteration (\d+) @(.+?): (.+)", entry_text)
-                if ts_match:
-                    iter_num = int(ts_match.group(1))
-                    ts_str = ts_match.group(2).strip()
-                    try:
-                        ts = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
-                    except ValueError:
-                        ts = datetime.now(timezone.utc)
-                    history.append(HistoryEntry(
-                        iteration=iter_num,
-                        summary=ts_match.group(3),
-                        timestamp=ts
-                    ))
-                else:
-                    # Fallback to old format: "iteration N: summary"
-                    parts = entry_text.split(": ", 1)
-                    if len(parts) == 2 and parts[0].startswith("iteration"):
-                        try:
-                            iter_num = int(parts[0].replace("iteration ", ""))
-                            history.append(HistoryEntry(iteration=iter_num, summary=parts[1]))
-                        except ValueError:
-                            continue
+        # Keep the raw timestamp; started_at_dt parses it if ever needed
+        started_at = fields.get("started_at", "").strip('"')
 
         return cls(
             active=active,
@@ -164,27 +379,82 @@ class RalphState:
             history=history
         )
 
+    @staticmethod
+    def _parse_history_entry(entry_text: str) -> HistoryEntry | None:
+        """Parse a single quoted history entry, returning None if malformed."""
+        if not entry_text.startswith("iteration "):
+            return None
+        rest = entry_text[len("iteration "):]
+
+        iter_str, sep, tail = rest.partition(" @")
+        if sep and iter_str.isdigit():
+            # Current format: "iteration N @timestamp: summary". The digit
+            # check keeps old-format summaries containing " @" out of this
+            # branch so they fall through to the old-format parse below.
+            ts_str, sep, summary = tail.partition(": ")
+            if not sep:
+                return None
+            try:
+                ts = _epoch(ts_str.strip())
+            except ValueError:
+                ts = int(time.time())
+            return HistoryEntry(iteration=int(iter_str), summary=summary, timestamp=ts)
+
+        # Fallback to old format: "iteration N: summary"
+        iter_str, sep, summary = rest.partition(": ")
+        if not sep:
+            return None
+        try:
+            return HistoryEntry(iteration=int(iter_str), summary=summary)
+        except ValueError:
+            return None
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the state header to JSON bytes (the sidecar format).
+
+        History lives in the append-only log, not the header, so the
+        sidecar stays a small constant-size write.
+        """
+        return json.dumps({
+            "active": self.active,
+            "iteration": self.iteration,
+            "max_iterations": self.max_iterations,
+            "completion_promise": self.completion_promise,
+            "started_at": (
+                self.started_at if isinstance(self.started_at, str)
+                else self.started_at.isoformat()
+            ),
+            "prompt": self.prompt,
+        }).encode("utf-8")
+
+    @staticmethod
+    def _history_record(entry: HistoryEntry) -> str:
+        """One JSON-per-line record for the history log."""
+        return json.dumps({
+            "iteration": entry.iteration,
+            "summary": entry.summary,
+            "timestamp": entry.timestamp,
+        }) + "\n"
+
     def to_string(self) -> str:
         """Convert state to string format."""
         promise_yaml = f'"{self.completion_promise}"' if self.completion_promise else "null"
 
-        # Ensure UTC for started_at
-        ts = self.started_at.astimezone(timezone.utc) if self.started_at.tzinfo else self.started_at
-        started_at_str = ts.strftime('%Y-%m-%dT%H:%M:%SZ')
+        # A raw string loaded from disk passes straight through unparsed
+        started_at_str = (
+            self.started_at if isinstance(self.started_at, str)
+            else _format_ts(self.started_at)
+        )
 
-        # Build history section
+        # Build history section in one join instead of quadratic +=
         history_yaml = ""
         if self.history:
-            history_yaml = "history:\n"
+            lines = ["history:"]
             for entry in self.history:
-                # Ensure UTC for history timestamps
-                h_ts = (
-                    entry.timestamp.astimezone(timezone.utc)
-                    if entry.timestamp.tzinfo
-                    else entry.timestamp
-                )
-                h_ts_str = h_ts.strftime('%Y-%m-%dT%H:%M:%SZ')
-                history_yaml += f'  - "iteration {entry.iteration} @{h_ts_str}: {entry.summary}"\n'
+                h_ts_str = _format_ts(entry.timestamp_dt)
+                lines.append(f'  - "iteration {entry.iteration} @{h_ts_str}: {entry.summary}"')
+            history_yaml = "\n".join(lines) + "\n"
 
         return f"""---
 active: {"true" if self.active else "false"}
@@ -198,10 +468,36 @@ started_at: "{started_at_str}"
 """
 
     def save(self, path: Path | str = DEFAULT_STATE_FILE) -> None:
-        """Save state to file."""
+        """
+        Save state to file.
+
+        Writes the JSON sidecar (machine source of truth) plus the markdown
+        file for human inspection.
+        """
+        from pathlib import Path
+
         path = Path(path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(self.to_string(), encoding="utf-8")
+        parent = path.parent
+        if parent not in _KNOWN_DIRS:
+            parent.mkdir(parents=True, exist_ok=True)
+            _KNOWN_DIRS.add(parent)
+        _write_atomic(_sidecar_path(path), self.to_bytes())
+        self._save_history_log(_history_log_path(path))
+        _write_atomic(path, self.to_string().encode("utf-8"))
+        _STATE_CACHE[path] = (_stat_signature(path), copy.deepcopy(self))
+
+    def _save_history_log(self, log_path: Path) -> None:
+        """Persist history, appending only entries not yet on disk."""
+        persisted = _HISTORY_PERSISTED.get(log_path)
+        if persisted is not None and persisted <= len(self.history) and log_path.exists():
+            new_entries = self.history[persisted:]
+            if new_entries:
+                with log_path.open("a", encoding="utf-8") as f:
+                    f.writelines(self._history_record(e) for e in new_entries)
+        else:
+            with log_path.open("w", encoding="utf-8") as f:
+                f.writelines(self._history_record(e) for e in self.history)
+        _HISTORY_PERSISTED[log_path] = len(self.history)
 
     def increment_iteration(self, summary: str = "") -> bool:
         """Advance to next iteration."""
@@ -209,10 +505,10 @@ started_at: "{started_at_str}"
             self.history.append(HistoryEntry(iteration=self.iteration, summary=summary))
 
         self.iteration += 1
-        if self.max_iterations > 0 and self.iteration > self.max_iterations:
-            self.active = False
-            return False
-        return True
+        self.active = self.active and (
+            self.max_iterations == 0 or self.iteration <= self.max_iterations
+        )
+        return self.active
 
     def should_continue(self) -> bool:
         """Check if loop should continue."""
@@ -241,20 +537,35 @@ started_at: "{started_at_str}"
         """Check for completion promise."""
         if not self.completion_promise:
             return False
-        pattern = rf"<promise>\s*{re.escape(self.completion_promise)}\s*</promise>"
-        return bool(re.search(pattern, output, re.IGNORECASE))
+        # Fast path: exact tags with no interior whitespace, matched by a
+        # C-level substring scan instead of the regex engine.
+        if _promise_needle(self.completion_promise) in output.casefold():
+            return True
+        # Whitespace-tolerant fallback: compare the captured tag contents
+        promise = self.completion_promise.strip().casefold()
+        return any(
+            match.group(1).strip().casefold() == promise
+            for match in _PROMISE_RE.finditer(output)
+        )
 
     @property
     def progress_percent(self) -> int | None:
         """Get progress percentage."""
         if self.max_iterations <= 0:
             return None
-        return min(100, int((self.iteration / self.max_iterations) * 100))
+        return min(100, (self.iteration * 100) // self.max_iterations)
 
     @property
     def status_display(self) -> str:
         """Get human-readable status."""
+        key = (self.active, self.iteration, self.max_iterations)
+        cached = self._status_cache
+        if cached is not None and cached[:3] == key:
+            return cached[3]
+
         max_iter = str(self.max_iterations) if self.max_iterations > 0 else "∞"
         status = "active" if self.active else "stopped"
         progress = f" ({self.progress_percent}%)" if self.progress_percent is not None else ""
-        return f"[{status}] Iteration {self.iteration}/{max_iter}{progress}"
+        display = f"[{status}] Iteration {self.iteration}/{max_iter}{progress}"
+        self._status_cache = (*key, display)
+        return display
@@ -1,8 +1,9 @@
 """Tests for Ralph Loop state management."""
 
-import tempfile
-from datetime import datetime, timezone
-from pathlib import Path
+import json
+from datetime import UTC, datetime
+
+import pytest
 
 from ralph_loop.state import RalphState
 
@@ -10,6 +11,12 @@ from ralph_loop.state import RalphState
 class TestRalphState:
     """Tests for RalphState class."""
 
+    @pytest.fixture(scope="class")
+    @staticmethod
+    def state_dir(tmp_path_factory):
+        """One tmp dir shared across the class; tests use unique subpaths."""
+        return tmp_path_factory.mktemp("ralph")
+
     def test_default_state(self):
         """Test creating a default state."""
         state = RalphState(prompt="Test task")
@@ -27,7 +34,7 @@ class TestRalphState:
             iteration=5,
             max_iterations=10,
             completion_promise="DONE",
-            started_at=datetime(2025, 1, 6, 12, 0, 0, tzinfo=timezone.utc),
+            started_at=datetime(2025, 1, 6, 12, 0, 0, tzinfo=UTC),
             prompt="Build a REST API",
         )
 
@@ -41,24 +48,123 @@ class TestRalphState:
         assert parsed.completion_promise == state.completion_promise
         assert parsed.prompt == state.prompt
 
-    def test_save_and_load(self):
+    def test_to_bytes_and_from_bytes(self):
+        """Test JSON serialization roundtrip."""
+        state = RalphState(
+            active=True,
+            iteration=5,
+            max_iterations=10,
+            completion_promise="DONE",
+            started_at=datetime(2025, 1, 6, 12, 0, 0, tzinfo=UTC),
+            prompt="Build a REST API",
+        )
+
+        parsed = RalphState.from_bytes(state.to_bytes())
+
+        assert parsed is not None
+        assert parsed.active == state.active
+        assert parsed.iteration == state.iteration
+        assert parsed.max_iterations == state.max_iterations
+        assert parsed.completion_promise == state.completion_promise
+        assert parsed.started_at_dt == state.started_at_dt
+        assert parsed.prompt == state.prompt
+
+    @pytest.mark.parametrize(
+        ("field_name", "value"),
+        [
+            ("iteration", None),
+            ("max_iterations", [10]),
+            ("started_at", 12345),
+        ],
+    )
+    def test_from_bytes_corrupt_field(self, field_name, value):
+        """Test that a corrupt sidecar field returns None, not a broken state."""
+        obj = json.loads(RalphState(prompt="Test").to_bytes())
+        obj[field_name] = value
+
+        assert RalphState.from_bytes(json.dumps(obj).encode()) is None
+
+    def test_save_and_load(self, state_dir):
         """Test file save and load."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            state_file = Path(tmpdir) / ".gemini" / "ralph-loop.local.md"
+        state_file = state_dir / "save_and_load" / "ralph-loop.local.md"
 
-            state = RalphState(
-                prompt="Test task",
-                max_iterations=5,
-                completion_promise="TEST COMPLETE",
-            )
-            state.save(state_file)
+        state = RalphState(
+            prompt="Test task",
+            max_iterations=5,
+            completion_promise="TEST COMPLETE",
+        )
+        state.save(state_file)
+
+        loaded = RalphState.from_file(state_file)
 
-            loaded = RalphState.from_file(state_file)
+        assert loaded is not None
+        assert loaded.prompt == "Test task"
+        assert loaded.max_iterations == 5
+        assert loaded.completion_promise == "TEST COMPLETE"
 
-            assert loaded is not None
-            assert loaded.prompt == "Test task"
-            assert loaded.max_iterations == 5
-            assert loaded.completion_promise == "TEST COMPLETE"
+    def test_history_persists_across_saves(self, state_dir):
+        """Test that history entries survive repeated save/load cycles."""
+        state_file = state_dir / "history_persists" / "ralph-loop.local.md"
+
+        state = RalphState(prompt="Test task")
+        state.increment_iteration("first step")
+        state.save(state_file)
+        state.increment_iteration("second step")
+        state.save(state_file)
+
+        loaded = RalphState.from_file(state_file)
+
+        assert loaded is not None
+        assert [entry.summary for entry in loaded.history] == ["first step", "second step"]
+        assert loaded.iteration == 3
+
+    def test_old_format_history_with_at_in_summary(self):
+        """Test old-format history entries whose summary contains ' @'."""
+        content = (
+            "---\n"
+            "active: true\n"
+            "iteration: 2\n"
+            "max_iterations: 0\n"
+            "completion_promise: null\n"
+            'started_at: "2025-01-06T12:00:00Z"\n'
+            "history:\n"
+            '  - "iteration 1: emailed @alice about the bug"\n'
+            "---\n"
+            "\n"
+            "Test task\n"
+        )
+
+        parsed = RalphState.from_string(content)
+
+        assert parsed is not None
+        assert len(parsed.history) == 1
+        assert parsed.history[0].iteration == 1
+        assert parsed.history[0].summary == "emailed @alice about the bug"
+
+    def test_save_and_load_large_prompt(self, state_dir):
+        """Test load of a file big enough to take the mmap path."""
+        state_file = state_dir / "large_prompt" / "ralph-loop.local.md"
+
+        prompt = "Build a REST API\n" * 8000  # well past the 64 KiB threshold
+        state = RalphState(prompt=prompt, max_iterations=5)
+        state.save(state_file)
+
+        loaded = RalphState.from_file(state_file)
+
+        assert loaded is not None
+        assert loaded.prompt == prompt
+        assert loaded.max_iterations == 5
+
+    def test_save_leaves_no_tempfiles(self, state_dir):
+        """Test that the atomic write renames every tempfile into place."""
+        state_file = state_dir / "no_tempfiles" / "ralph-loop.local.md"
+
+        state = RalphState(prompt="Test task")
+        state.increment_iteration("step")
+        state.save(state_file)
+
+        leftovers = list(state_file.parent.glob("*.tmp"))
+        assert leftovers == []
 
     def test_increment_iteration(self):
         """Test iteration increment."""
@@ -100,27 +206,24 @@ class TestRalphState:
         state.active = False
         assert state.should_continue() is False
 
-    def test_check_promise(self):
+    @pytest.mark.parametrize(
+        ("promise", "output", "expected"),
+        [
+            # No promise in output
+            ("ALL TESTS PASS", "Some output", False),
+            # Promise present
+            ("ALL TESTS PASS", "<promise>ALL TESTS PASS</promise>", True),
+            # Case insensitive
+            ("ALL TESTS PASS", "<PROMISE>ALL TESTS PASS</PROMISE>", True),
+            # No promise set
+            (None, "<promise>ANYTHING</promise>", False),
+        ],
+    )
+    def test_check_promise(self, promise, output, expected):
         """Test promise checking."""
-        state = RalphState(
-            prompt="Test",
-            completion_promise="ALL TESTS PASS",
-        )
+        state = RalphState(prompt="Test", completion_promise=promise)
 
-        # No promise in output
-        assert state.check_promise("Some output") is False
-
-        # Promise present
-        assert state.check_promise("<promise>ALL TESTS PASS</promise>") is True
-
-        # Case insensitive
-        assert state.check_promise("<PROMISE>ALL TESTS PASS</PROMISE>") is True
-
-    def test_check_promise_none(self):
-        """Test promise checking when no promise set."""
-        state = RalphState(prompt="Test")
-
-        assert state.check_promise("<promise>ANYTHING</promise>") is False
+        assert state.check_promise(output) is expected
 
     def test_complete(self):
         """Test completing the loop."""
@@ -134,6 +237,14 @@ class TestRalphState:
         state = RalphState.from_file("/nonexistent/path/file.md")
         assert state is None
 
+    def test_slots(self):
+        """Test that instances stay dict-free (slots=True)."""
+        state = RalphState(prompt="Test")
+        state.increment_iteration("step")
+
+        assert not hasattr(state, "__dict__")
+        assert not hasattr(state.history[0], "__dict__")
+
     def test_status_display(self):
         """Test status display string."""
         state = RalphState(prompt="Test", iteration=5, max_iterations=10, active=True)